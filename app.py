@@ -1,97 +1,337 @@
-from flask import Flask, request, jsonify
-import pandas as pd
+from flask import Flask, Response, request, jsonify, stream_with_context
 from langdetect import detect
-from transformers import MarianMTModel, MarianTokenizer
+from transformers import GenerationConfig, MarianMTModel, MarianTokenizer
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import logging
+import threading
 import os
+import pickle
+import sys
+import torch
+
+try:
+    import ctranslate2
+except ImportError:
+    ctranslate2 = None
+
+try:
+    import gcld3
+except ImportError:
+    gcld3 = None
 
 app = Flask(__name__)
+logger = logging.getLogger(__name__)
 
 # Global variables
 french_to_shimarore = {}
 shimarore_to_french = {}
-models = {}
+french_phrase_index = {}
+shimarore_phrase_index = {}
+FR_EN_TOK = FR_EN_MODEL = FR_EN_DECODING = None
+EN_FR_TOK = EN_FR_MODEL = EN_FR_DECODING = None
+SW_EN_TOK = SW_EN_MODEL = SW_EN_DECODING = None
+EN_SW_TOK = EN_SW_MODEL = EN_SW_DECODING = None
+health_payload = None
+initialized = False
+# Process the CTranslate2 translators were loaded in; they do not survive fork()
+ctranslate2_pid = None
+ctranslate2_lock = threading.Lock()
+
+# Source dictionary and its pickled (french_to_shimarore, shimarore_to_french) cache,
+# built with build_dictionary_cache.py
+DICTIONARY_PATH = os.environ.get("DICTIONARY_PATH", "dictionary.csv")
+DICTIONARY_CACHE_PATH = os.environ.get("DICTIONARY_CACHE_PATH", "dicts.pkl")
+
+# LRU cache of model hop outputs keyed by (direction, text), e.g. ('fr_en', 'bonjour')
+TRANSLATION_CACHE_SIZE = 4096
+translation_cache = OrderedDict()
+translation_cache_lock = threading.Lock()
+
+# Batch sentences are translated in chunks of this size so the two hops can overlap
+BATCH_CHUNK_SIZE = 16
+
+# Share of dictionary words that decides the language without calling langdetect
+DICTIONARY_DETECTION_RATIO = 0.3
+
+# cld3 (C++) language identifier, used instead of langdetect when installed
+if gcld3 is not None:
+    language_identifier = gcld3.NNetLanguageIdentifier(min_num_bytes=0, max_num_bytes=1000)
+else:
+    language_identifier = None
+language_identifier_lock = threading.Lock()
 
-def load_model_and_tokenizer(model_path):
-    """Load model and tokenizer from local directory"""
+# CTranslate2 int8 models are used when converted, e.g. with
+#   ct2-transformers-converter --model fine_tuned_fr_en_model --output_dir ct2_fr_en --quantization int8
+
+def load_model_and_tokenizer(model_path, ct2_model_path=None, load_ctranslate2=True):
+    """Load tokenizer, model and CTranslate2 decoding options, preferring a CTranslate2 conversion
+
+    With load_ctranslate2=False a converted model is left as None, to be loaded
+    later by load_ctranslate2_models in the process that serves requests.
+    """
     try:
         tokenizer = MarianTokenizer.from_pretrained(model_path)
-        model = MarianMTModel.from_pretrained(model_path)
-        return tokenizer, model
+        if ctranslate2 is not None and ct2_model_path and os.path.isdir(ct2_model_path):
+            model = load_ctranslate2_model(ct2_model_path) if load_ctranslate2 else None
+            decoding = load_decoding_options(model_path)
+        else:
+            model = MarianMTModel.from_pretrained(model_path).eval()
+            decoding = None
+        return tokenizer, model, decoding
     except Exception as e:
-        print(f"Error loading model from {model_path}: {e}")
-        return None, None
+        logger.error("Error loading model from %s: %s", model_path, e)
+        return None, None, None
+
+def load_decoding_options(model_path):
+    """CTranslate2 decoding options matching the model's own generation_config.json"""
+    generation_config = GenerationConfig.from_pretrained(model_path)
+    return {
+        "beam_size": generation_config.num_beams,
+        "max_decoding_length": generation_config.max_length
+    }
 
-def initialize_app():
-    """Initialize dictionaries and models"""
-    global french_to_shimarore, shimarore_to_french, models
+def load_ctranslate2_model(ct2_model_path, intra_threads=None):
+    """Load an int8 CTranslate2 translator"""
+    return ctranslate2.Translator(
+        ct2_model_path,
+        compute_type="int8",
+        inter_threads=1,
+        intra_threads=intra_threads or os.cpu_count() or 0
+    )
+
+def load_ctranslate2_models(intra_threads=None):
+    """Load the CTranslate2 translators deferred by initialize_app(load_ctranslate2=False)
+
+    Translators own worker threads that do not survive fork(), so under a
+    preloading server they must be created in each worker, never in the master.
+    """
+    global FR_EN_MODEL, EN_FR_MODEL, SW_EN_MODEL, EN_SW_MODEL, health_payload, ctranslate2_pid
+    
+    with ctranslate2_lock:
+        if ctranslate2_pid == os.getpid():
+            return
+        ctranslate2_pid = os.getpid()
+        if ctranslate2 is None:
+            return
+        
+        def load(tokenizer, model, ct2_model_path):
+            if tokenizer is not None and model is None and os.path.isdir(ct2_model_path):
+                return load_ctranslate2_model(ct2_model_path, intra_threads)
+            return model
+        
+        FR_EN_MODEL = load(FR_EN_TOK, FR_EN_MODEL, "ct2_fr_en")
+        EN_FR_MODEL = load(EN_FR_TOK, EN_FR_MODEL, "ct2_en_fr")
+        SW_EN_MODEL = load(SW_EN_TOK, SW_EN_MODEL, "ct2_sw_en")
+        EN_SW_MODEL = load(EN_SW_TOK, EN_SW_MODEL, "ct2_en_sw")
+        health_payload = build_health_payload()
+
+def ensure_ctranslate2_models():
+    """Load deferred CTranslate2 translators on first use in the serving process
+
+    Covers servers that fork without running gunicorn.conf.py's post_fork hook.
+    """
+    if ctranslate2_pid != os.getpid():
+        load_ctranslate2_models()
+
+def load_dictionaries_from_csv(csv_path):
+    """Build (french_to_shimarore, shimarore_to_french) from the dictionary CSV"""
+    import pandas as pd
+    
+    df = pd.read_csv(csv_path, usecols=['text', 'target'], dtype=str).dropna()
+    french_words = df['text'].str.lower().to_numpy()
+    shimarore_words = df['target'].str.lower().to_numpy()
+    del df
+    
+    # Both directions share one interned string object per word
+    pairs = [(sys.intern(french), sys.intern(shimarore)) for french, shimarore in zip(french_words, shimarore_words)]
+    french_to_shimarore = {french: shimarore for french, shimarore in pairs}
+    shimarore_to_french = {shimarore: french for french, shimarore in pairs}
+    return french_to_shimarore, shimarore_to_french
+
+def load_dictionaries():
+    """Load the dictionaries from the pickled cache when it is up to date, else from the CSV"""
+    if os.path.exists(DICTIONARY_CACHE_PATH) and (
+            not os.path.exists(DICTIONARY_PATH)
+            or os.path.getmtime(DICTIONARY_CACHE_PATH) >= os.path.getmtime(DICTIONARY_PATH)):
+        try:
+            with open(DICTIONARY_CACHE_PATH, 'rb') as f:
+                return pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError) as e:
+            logger.warning("Ignoring unreadable dictionary cache %s: %s", DICTIONARY_CACHE_PATH, e)
+    return load_dictionaries_from_csv(DICTIONARY_PATH)
+
+def initialize_app(load_ctranslate2=True):
+    """Initialize dictionaries and models (only once per process)"""
+    global french_to_shimarore, shimarore_to_french, french_phrase_index, shimarore_phrase_index
+    global health_payload, initialized, ctranslate2_pid
+    global FR_EN_TOK, FR_EN_MODEL, EN_FR_TOK, EN_FR_MODEL, SW_EN_TOK, SW_EN_MODEL, EN_SW_TOK, EN_SW_MODEL
+    global FR_EN_DECODING, EN_FR_DECODING, SW_EN_DECODING, EN_SW_DECODING
+    
+    if initialized:
+        return
+    initialized = True
+    if load_ctranslate2:
+        ctranslate2_pid = os.getpid()
     
     try:
         # Load dataset
-        df = pd.read_csv("data (1).csv")
-        french_to_shimarore = dict(zip(df['text'].str.lower(), df['target'].str.lower()))
-        shimarore_to_french = dict(zip(df['target'].str.lower(), df['text'].str.lower()))
+        french_to_shimarore, shimarore_to_french = load_dictionaries()
+        french_phrase_index = build_phrase_index(french_to_shimarore)
+        shimarore_phrase_index = build_phrase_index(shimarore_to_french)
         
-        print("Dictionary loaded successfully!")
+        logger.info("Dictionary loaded successfully!")
         
         # Load models
-        print("Loading translation models...")
-        models['fr_en_tokenizer'], models['fr_en_model'] = load_model_and_tokenizer("fine_tuned_fr_en_model")
-        models['en_fr_tokenizer'], models['en_fr_model'] = load_model_and_tokenizer("fine_tuned_en_fr_model")
-        models['sw_en_tokenizer'], models['sw_en_model'] = load_model_and_tokenizer("fine_tuned_sw_en_model")
-        models['en_sw_tokenizer'], models['en_sw_model'] = load_model_and_tokenizer("fine_tuned_en_sw_model")
+        logger.info("Loading translation models...")
+        FR_EN_TOK, FR_EN_MODEL, FR_EN_DECODING = load_model_and_tokenizer(
+            "fine_tuned_fr_en_model", "ct2_fr_en", load_ctranslate2)
+        EN_FR_TOK, EN_FR_MODEL, EN_FR_DECODING = load_model_and_tokenizer(
+            "fine_tuned_en_fr_model", "ct2_en_fr", load_ctranslate2)
+        SW_EN_TOK, SW_EN_MODEL, SW_EN_DECODING = load_model_and_tokenizer(
+            "fine_tuned_sw_en_model", "ct2_sw_en", load_ctranslate2)
+        EN_SW_TOK, EN_SW_MODEL, EN_SW_DECODING = load_model_and_tokenizer(
+            "fine_tuned_en_sw_model", "ct2_en_sw", load_ctranslate2)
         
-        print("All models loaded successfully!")
+        logger.info("All models loaded successfully!")
         
     except Exception as e:
-        print(f"Error during initialization: {e}")
+        logger.error("Error during initialization: %s", e)
+    
+    # Dictionaries and models don't change after startup
+    health_payload = build_health_payload()
+
+def build_phrase_index(mapping_dict):
+    """Index multi-word dictionary entries by their first word, longest phrase first"""
+    phrase_index = {}
+    for key, value in mapping_dict.items():
+        phrase = tuple(key.split())
+        if len(phrase) > 1:
+            phrase_index.setdefault(phrase[0], []).append((phrase, value))
+    
+    for phrases in phrase_index.values():
+        phrases.sort(key=lambda entry: len(entry[0]), reverse=True)
+    return phrase_index
 
-def replace_words_with_mapping(text, mapping_dict):
-    """Replace words using provided mapping dictionary"""
-    words = text.lower().split()
+def replace_words_with_mapping(words, mapping_dict, phrase_index):
+    """Replace already lowercased words using provided mapping dictionary and its phrase index"""
     replaced_words = []
     replaced = False
+    position = 0
     
-    for word in words:
-        if word in mapping_dict:
-            replaced_words.append(mapping_dict[word])
-            replaced = True
+    while position < len(words):
+        word = words[position]
+        
+        # Multi-word entries starting here win over the single word
+        for phrase, replacement in phrase_index.get(word, ()):
+            if words[position:position + len(phrase)] == phrase:
+                replaced_words.append(replacement)
+                replaced = True
+                position += len(phrase)
+                break
         else:
-            replaced_words.append(word)
+            if word in mapping_dict:
+                replaced_words.append(mapping_dict[word])
+                replaced = True
+            else:
+                replaced_words.append(word)
+            position += 1
     
     return ' '.join(replaced_words), replaced
 
-def translate_text(text, tokenizer, model):
-    """Translate text using provided model"""
-    try:
-        inputs = tokenizer(text, return_tensors="pt", padding=True, truncation=True)
-        translated = model.generate(**inputs)
-        return tokenizer.decode(translated[0], skip_special_tokens=True)
-    except Exception as e:
-        return f"Translation error: {str(e)}"
+def translate_hop(hop, texts):
+    """Translate texts through one (direction, tokenizer, model, decoding) hop, reusing cached outputs"""
+    direction, tokenizer, model, decoding = hop
+    outputs = [None] * len(texts)
+    pending = {}
+    
+    with translation_cache_lock:
+        for index, text in enumerate(texts):
+            key = (direction, text)
+            if key in translation_cache:
+                translation_cache.move_to_end(key)
+                outputs[index] = translation_cache[key]
+            else:
+                pending.setdefault(text, []).append(index)
+    
+    if pending:
+        pending_texts = list(pending)
+        translated = translate_batch(pending_texts, tokenizer, model, decoding)
+        
+        with translation_cache_lock:
+            for text, output in zip(pending_texts, translated):
+                for index in pending[text]:
+                    outputs[index] = output
+                
+                # Don't remember failures so the next request retries the model
+                if output.startswith("Translation error:"):
+                    continue
+                translation_cache[(direction, text)] = output
+                if len(translation_cache) > TRANSLATION_CACHE_SIZE:
+                    translation_cache.popitem(last=False)
+    
+    return outputs
 
-def detect_language_smart(text):
-    """Smart language detection with fallbacks"""
+def translate_batch(texts, tokenizer, model, decoding=None):
+    """Translate a list of texts with a single batched generate call"""
     try:
-        detected = detect(text)
-        return detected
-    except:
-        # Fallback: check if words exist in our dictionaries
-        words = text.lower().split()
-        french_matches = sum(1 for word in words if word in french_to_shimarore)
-        shimarore_matches = sum(1 for word in words if word in shimarore_to_french)
+        if ctranslate2 is not None and isinstance(model, ctranslate2.Translator):
+            source_tokens = [
+                tokenizer.convert_ids_to_tokens(tokenizer.encode(text, truncation=True))
+                for text in texts
+            ]
+            translated = model.translate_batch(source_tokens, **(decoding or {}))
+            return [
+                tokenizer.decode(tokenizer.convert_tokens_to_ids(result.hypotheses[0]), skip_special_tokens=True)
+                for result in translated
+            ]
         
-        if french_matches > shimarore_matches:
-            return "fr"
-        elif shimarore_matches > french_matches:
-            return "sw"
-        else:
-            return "unknown"
+        # A single sequence needs no padding
+        inputs = tokenizer(texts, return_tensors="pt", padding=len(texts) > 1, truncation=True)
+        with torch.inference_mode():
+            translated = model.generate(**inputs)
+        return tokenizer.batch_decode(translated, skip_special_tokens=True)
+    except Exception as e:
+        return [f"Translation error: {str(e)}"] * len(texts)
+
+@lru_cache(maxsize=4096)
+def detect_language_smart(sentence, words):
+    """Smart language detection with fallbacks, given the lowercased sentence and its words"""
+    # Check dictionary hits first: a clear majority skips the language identifier
+    french_matches = sum(1 for word in words if word in french_to_shimarore)
+    shimarore_matches = sum(1 for word in words if word in shimarore_to_french)
+    
+    if words and french_matches != shimarore_matches:
+        if max(french_matches, shimarore_matches) / len(words) >= DICTIONARY_DETECTION_RATIO:
+            return "fr" if french_matches > shimarore_matches else "sw"
+    
+    if language_identifier is not None:
+        with language_identifier_lock:
+            result = language_identifier.FindLanguage(text=sentence)
+        # Only trust confident predictions; otherwise use the dictionary fallback
+        if result.is_reliable:
+            return result.language
+    else:
+        try:
+            detected = detect(sentence)
+            return detected
+        except:
+            pass
+    
+    # Fallback: check if words exist in our dictionaries
+    if french_matches > shimarore_matches:
+        return "fr"
+    elif shimarore_matches > french_matches:
+        return "sw"
+    else:
+        return "unknown"
 
 @app.route('/')
 def home():
     return jsonify({
         "message": "Unified French-Shimarore Translation API",
-        "usage": "POST to /translate with {'text': 'your text'} or {'texts': ['text1', 'text2']}",
+        "usage": "POST to /translate with {'text': 'your text'} or {'texts': ['text1', 'text2']} (add 'stream': true for NDJSON results)",
         "features": [
             "Single word direct mapping",
             "Full sentence translation",
@@ -121,10 +361,15 @@ def translate():
             if not isinstance(data['texts'], list):
                 return jsonify({"error": "'texts' must be a list"}), 400
             
-            results = []
-            for text in data['texts']:
-                result = process_single_translation(text)
-                results.append(result)
+            if data.get('stream'):
+                # Stream one JSON line per result as soon as it is ready
+                def generate():
+                    for index, result in iter_batch_translation(data['texts']):
+                        yield app.json.dumps({"index": index, "result": result}) + "\n"
+                
+                return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+            
+            results = process_batch_translation(data['texts'])
             
             return jsonify({
                 "batch_translation": True,
@@ -143,149 +388,265 @@ def translate():
 def process_single_translation(text):
     """Process a single text translation"""
     try:
-        if not text or not text.strip():
-            return {"error": "Empty text provided"}
+        original_text = text.strip() if text else ""
+        sentence = original_text.lower()
+        return process_prepared_translation(original_text, sentence, tuple(sentence.split()))
+    
+    except Exception as e:
+        return {"error": f"Processing failed: {str(e)}"}
+
+def process_prepared_translation(original_text, sentence, words):
+    """Process a stripped text, given its lowercased sentence and words"""
+    if not words:
+        return {"error": "Empty text provided"}
+    
+    # SINGLE WORD HANDLING
+    if len(words) == 1:
+        # Direct mapping lookup
+        if sentence in french_to_shimarore:
+            return {
+                "input": original_text,
+                "output": french_to_shimarore[sentence],
+                "translation_type": "direct_mapping",
+                "source_language": "french",
+                "target_language": "shimarore",
+                "method": "dictionary_lookup"
+            }
+        
+        elif sentence in shimarore_to_french:
+            return {
+                "input": original_text,
+                "output": shimarore_to_french[sentence],
+                "translation_type": "direct_mapping", 
+                "source_language": "shimarore",
+                "target_language": "french",
+                "method": "dictionary_lookup"
+            }
+        
+        else:
+            return {
+                "input": original_text,
+                "output": None,
+                "translation_type": "single_word_not_found",
+                "error": "Word not found in dictionary",
+                "suggestion": "Try using the word in a complete sentence for AI translation"
+            }
+    
+    # FULL SENTENCE HANDLING
+    else:
+        detected_lang = detect_language_smart(sentence, words)
+        
+        if detected_lang == "fr":
+            # French to Shimarore
+            return translate_french_to_shimarore(original_text, sentence, words)
+        
+        elif detected_lang == "sw":
+            # Shimarore to French  
+            return translate_shimarore_to_french(original_text, sentence, words)
+        
+        else:
+            return unsupported_language_result(original_text, detected_lang)
+
+def unsupported_language_result(original_text, detected_lang):
+    """Result for a sentence whose language is neither French nor Shimarore"""
+    return {
+        "input": original_text,
+        "output": None,
+        "detected_language": detected_lang,
+        "error": "Language not supported or could not be detected",
+        "supported_languages": ["French (fr)", "Shimarore/Swahili (sw)"]
+    }
+
+def process_batch_translation(texts):
+    """Process a batch of texts, grouping full sentences by direction"""
+    results = [None] * len(texts)
+    for index, result in iter_batch_translation(texts):
+        results[index] = result
+    return results
+
+def iter_batch_translation(texts):
+    """Yield (index, result) pairs for a batch as soon as each result is ready"""
+    sentences_by_language = {"fr": [], "sw": []}
+    
+    for index, text in enumerate(texts):
+        if not isinstance(text, str):
+            yield index, process_single_translation(text)
+            continue
         
         original_text = text.strip()
-        sentence = text.strip().lower()
+        sentence = original_text.lower()
+        words = tuple(sentence.split())
         
-        # SINGLE WORD HANDLING
-        if len(sentence.split()) == 1:
-            # Direct mapping lookup
-            if sentence in french_to_shimarore:
-                return {
-                    "input": original_text,
-                    "output": french_to_shimarore[sentence],
-                    "translation_type": "direct_mapping",
-                    "source_language": "french",
-                    "target_language": "shimarore",
-                    "method": "dictionary_lookup"
-                }
-            
-            elif sentence in shimarore_to_french:
-                return {
-                    "input": original_text,
-                    "output": shimarore_to_french[sentence],
-                    "translation_type": "direct_mapping", 
-                    "source_language": "shimarore",
-                    "target_language": "french",
-                    "method": "dictionary_lookup"
-                }
-            
-            else:
-                return {
-                    "input": original_text,
-                    "output": None,
-                    "translation_type": "single_word_not_found",
-                    "error": "Word not found in dictionary",
-                    "suggestion": "Try using the word in a complete sentence for AI translation"
-                }
+        # Empty input and single words need no model
+        if len(words) <= 1:
+            yield index, process_prepared_translation(original_text, sentence, words)
+            continue
         
-        # FULL SENTENCE HANDLING
+        detected_lang = detect_language_smart(sentence, words)
+        if detected_lang in sentences_by_language:
+            sentences_by_language[detected_lang].append((index, original_text, sentence, words))
         else:
-            detected_lang = detect_language_smart(sentence)
-            
-            if detected_lang == "fr":
-                # French to Shimarore
-                return translate_french_to_shimarore(original_text, sentence)
-            
-            elif detected_lang == "sw":
-                # Shimarore to French  
-                return translate_shimarore_to_french(original_text, sentence)
-            
-            else:
-                return {
-                    "input": original_text,
-                    "output": None,
-                    "detected_language": detected_lang,
-                    "error": "Language not supported or could not be detected",
-                    "supported_languages": ["French (fr)", "Shimarore/Swahili (sw)"]
-                }
+            yield index, unsupported_language_result(original_text, detected_lang)
     
-    except Exception as e:
-        return {"error": f"Processing failed: {str(e)}"}
+    batch_translators = {
+        "fr": translate_french_to_shimarore_batch,
+        "sw": translate_shimarore_to_french_batch
+    }
+    for language, entries in sentences_by_language.items():
+        if not entries:
+            continue
+        indices = iter(index for index, *_ in entries)
+        items = [entry[1:] for entry in entries]
+        for chunk_results in batch_translators[language](items):
+            for result in chunk_results:
+                yield next(indices), result
 
-def translate_french_to_shimarore(original_text, sentence):
+def translate_two_hops(texts, first_hop, second_hop):
+    """Yield (intermediate, final) translations chunk by chunk, overlapping the two hops"""
+    chunks = [texts[i:i + BATCH_CHUNK_SIZE] for i in range(0, len(texts), BATCH_CHUNK_SIZE)]
+    
+    # Workers limited to one inference thread (gunicorn.conf.py) already have a process
+    # per core, so a second concurrent hop would only oversubscribe the CPU
+    if len(chunks) <= 1 or torch.get_num_threads() <= 1:
+        for chunk in chunks:
+            intermediate_texts = translate_hop(first_hop, chunk)
+            yield intermediate_texts, translate_hop(second_hop, intermediate_texts)
+        return
+    
+    def run_second_hop(intermediate_texts):
+        return intermediate_texts, translate_hop(second_hop, intermediate_texts)
+    
+    # The second hop of chunk k runs in the executor while this thread runs the first hop of chunk k+1
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending = None
+        for chunk in chunks:
+            intermediate_texts = translate_hop(first_hop, chunk)
+            if pending is not None:
+                yield pending.result()
+            pending = executor.submit(run_second_hop, intermediate_texts)
+        yield pending.result()
+
+def translate_french_to_shimarore(original_text, sentence, words):
     """Translate French text to Shimarore"""
+    return next(translate_french_to_shimarore_batch([(original_text, sentence, words)]))[0]
+
+def translate_french_to_shimarore_batch(items):
+    """Yield result lists for (original_text, sentence, words) items from French to Shimarore, chunk by chunk"""
+    done = 0
     try:
         # Step 1: Replace French words with Shimarore equivalents
-        processed_sentence, words_replaced = replace_words_with_mapping(sentence, french_to_shimarore)
+        replacements = [replace_words_with_mapping(words, french_to_shimarore, french_phrase_index) for _, _, words in items]
+        processed_sentences = [processed_sentence for processed_sentence, _ in replacements]
         
-        # Step 2: Translate via English
-        if models['fr_en_tokenizer'] and models['en_sw_tokenizer']:
-            english_text = translate_text(processed_sentence, models['fr_en_tokenizer'], models['fr_en_model'])
-            shimarore_text = translate_text(english_text, models['en_sw_tokenizer'], models['en_sw_model'])
-            
-            return {
-                "input": original_text,
-                "output": shimarore_text,
-                "translation_type": "full_sentence",
-                "source_language": "french",
-                "target_language": "shimarore",
-                "method": "dictionary_preprocessing + ai_translation",
-                "processing_steps": {
-                    "1_original": sentence,
-                    "2_after_dictionary": processed_sentence,
-                    "3_intermediate_english": english_text,
-                    "4_final_shimarore": shimarore_text
-                },
-                "words_replaced_from_dictionary": words_replaced
-            }
+        # Step 2: Translate via English, one batched generate call per hop and chunk (cached)
+        ensure_ctranslate2_models()
+        if FR_EN_MODEL is not None and EN_SW_MODEL is not None:
+            hops = translate_two_hops(
+                processed_sentences,
+                ('fr_en', FR_EN_TOK, FR_EN_MODEL, FR_EN_DECODING),
+                ('en_sw', EN_SW_TOK, EN_SW_MODEL, EN_SW_DECODING)
+            )
+            for english_texts, shimarore_texts in hops:
+                results = []
+                for (original_text, sentence, _), (processed_sentence, words_replaced), english_text, shimarore_text in zip(
+                        items[done:done + len(english_texts)], replacements[done:done + len(english_texts)],
+                        english_texts, shimarore_texts):
+                    results.append({
+                        "input": original_text,
+                        "output": shimarore_text,
+                        "translation_type": "full_sentence",
+                        "source_language": "french",
+                        "target_language": "shimarore",
+                        "method": "dictionary_preprocessing + ai_translation",
+                        "processing_steps": {
+                            "1_original": sentence,
+                            "2_after_dictionary": processed_sentence,
+                            "3_intermediate_english": english_text,
+                            "4_final_shimarore": shimarore_text
+                        },
+                        "words_replaced_from_dictionary": words_replaced
+                    })
+                done += len(results)
+                yield results
         else:
-            return {"error": "French to Shimarore translation models not available"}
+            yield [{"error": "French to Shimarore translation models not available"} for _ in items]
     
     except Exception as e:
-        return {"error": f"French to Shimarore translation failed: {str(e)}"}
+        yield [{"error": f"French to Shimarore translation failed: {str(e)}"} for _ in items[done:]]
 
-def translate_shimarore_to_french(original_text, sentence):
+def translate_shimarore_to_french(original_text, sentence, words):
     """Translate Shimarore text to French"""
+    return next(translate_shimarore_to_french_batch([(original_text, sentence, words)]))[0]
+
+def translate_shimarore_to_french_batch(items):
+    """Yield result lists for (original_text, sentence, words) items from Shimarore to French, chunk by chunk"""
+    done = 0
     try:
         # Step 1: Replace Shimarore words with French equivalents
-        processed_sentence, words_replaced = replace_words_with_mapping(sentence, shimarore_to_french)
+        replacements = [replace_words_with_mapping(words, shimarore_to_french, shimarore_phrase_index) for _, _, words in items]
+        processed_sentences = [processed_sentence for processed_sentence, _ in replacements]
         
-        # Step 2: Translate via English
-        if models['sw_en_tokenizer'] and models['en_fr_tokenizer']:
-            english_text = translate_text(processed_sentence, models['sw_en_tokenizer'], models['sw_en_model'])
-            french_text = translate_text(english_text, models['en_fr_tokenizer'], models['en_fr_model'])
-            
-            return {
-                "input": original_text,
-                "output": french_text,
-                "translation_type": "full_sentence",
-                "source_language": "shimarore",
-                "target_language": "french", 
-                "method": "dictionary_preprocessing + ai_translation",
-                "processing_steps": {
-                    "1_original": sentence,
-                    "2_after_dictionary": processed_sentence,
-                    "3_intermediate_english": english_text,
-                    "4_final_french": french_text
-                },
-                "words_replaced_from_dictionary": words_replaced
-            }
+        # Step 2: Translate via English, one batched generate call per hop and chunk (cached)
+        ensure_ctranslate2_models()
+        if SW_EN_MODEL is not None and EN_FR_MODEL is not None:
+            hops = translate_two_hops(
+                processed_sentences,
+                ('sw_en', SW_EN_TOK, SW_EN_MODEL, SW_EN_DECODING),
+                ('en_fr', EN_FR_TOK, EN_FR_MODEL, EN_FR_DECODING)
+            )
+            for english_texts, french_texts in hops:
+                results = []
+                for (original_text, sentence, _), (processed_sentence, words_replaced), english_text, french_text in zip(
+                        items[done:done + len(english_texts)], replacements[done:done + len(english_texts)],
+                        english_texts, french_texts):
+                    results.append({
+                        "input": original_text,
+                        "output": french_text,
+                        "translation_type": "full_sentence",
+                        "source_language": "shimarore",
+                        "target_language": "french", 
+                        "method": "dictionary_preprocessing + ai_translation",
+                        "processing_steps": {
+                            "1_original": sentence,
+                            "2_after_dictionary": processed_sentence,
+                            "3_intermediate_english": english_text,
+                            "4_final_french": french_text
+                        },
+                        "words_replaced_from_dictionary": words_replaced
+                    })
+                done += len(results)
+                yield results
         else:
-            return {"error": "Shimarore to French translation models not available"}
+            yield [{"error": "Shimarore to French translation models not available"} for _ in items]
     
     except Exception as e:
-        return {"error": f"Shimarore to French translation failed: {str(e)}"}
+        yield [{"error": f"Shimarore to French translation failed: {str(e)}"} for _ in items[done:]]
 
-@app.route('/health', methods=['GET'])
-def health():
-    """Health check endpoint"""
-    return jsonify({
+def build_health_payload():
+    """Build the health check payload from the loaded dictionaries and models"""
+    return {
         "status": "healthy",
         "dictionary_entries": {
             "french_to_shimarore": len(french_to_shimarore),
             "shimarore_to_french": len(shimarore_to_french)
         },
         "models_loaded": {
-            "fr_en": models.get('fr_en_model') is not None,
-            "en_fr": models.get('en_fr_model') is not None, 
-            "sw_en": models.get('sw_en_model') is not None,
-            "en_sw": models.get('en_sw_model') is not None
+            "fr_en": FR_EN_MODEL is not None,
+            "en_fr": EN_FR_MODEL is not None, 
+            "sw_en": SW_EN_MODEL is not None,
+            "en_sw": EN_SW_MODEL is not None
         }
-    })
+    }
+
+@app.route('/health', methods=['GET'])
+def health():
+    """Health check endpoint"""
+    ensure_ctranslate2_models()
+    response = jsonify(health_payload or build_health_payload())
+    response.headers['Cache-Control'] = 'max-age=5'
+    return response
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
     initialize_app()
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    app.run(host='0.0.0.0', port=5000)
@@ -0,0 +1,17 @@
+"""Pre-build the pickled dictionary cache so app startup can skip CSV parsing.
+
+Re-run after editing the dictionary CSV; the app ignores a cache older than the CSV.
+The CSV and cache paths come from the DICTIONARY_PATH and DICTIONARY_CACHE_PATH
+environment variables, the same ones the app reads:
+
+    DICTIONARY_PATH=path/to/dictionary.csv python build_dictionary_cache.py
+"""
+import pickle
+
+from app import DICTIONARY_CACHE_PATH, DICTIONARY_PATH, load_dictionaries_from_csv
+
+if __name__ == '__main__':
+    dictionaries = load_dictionaries_from_csv(DICTIONARY_PATH)
+    with open(DICTIONARY_CACHE_PATH, 'wb') as f:
+        pickle.dump(dictionaries, f, protocol=5)
+    print(f"Wrote {len(dictionaries[0])} entries from {DICTIONARY_PATH} to {DICTIONARY_CACHE_PATH}")
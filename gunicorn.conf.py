@@ -0,0 +1,19 @@
+import multiprocessing
+import os
+
+bind = os.environ.get("BIND", "0.0.0.0:5000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = 1
+
+# Load wsgi.py (and the models) once in the master before forking workers
+preload_app = True
+wsgi_app = "wsgi:app"
+
+def post_fork(server, worker):
+    """One inference thread per worker; worker processes provide the parallelism"""
+    import torch
+    from app import load_ctranslate2_models
+    
+    torch.set_num_threads(1)
+    # Deferred by wsgi.py: translators must be created after fork
+    load_ctranslate2_models(intra_threads=1)
@@ -0,0 +1,14 @@
+"""WSGI entry point: dictionaries and models are loaded once at import time.
+
+Run under Gunicorn so the preloaded models are shared with every worker
+through fork copy-on-write:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+CTranslate2 translators cannot be shared across fork(), so they are not
+loaded here; gunicorn.conf.py loads them in each worker after it forks, and
+any other server loads them on the first request in each process.
+"""
+from app import app, initialize_app
+
+initialize_app(load_ctranslate2=False)